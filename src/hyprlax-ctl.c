@@ -4,10 +4,12 @@
  * Usage:
  *   hyprlax-ctl add <image> [scale=1.0] [opacity=1.0] [x=0] [y=0] [z=0]
  *   hyprlax-ctl remove <id>
- *   hyprlax-ctl modify <id> <property> <value>
+ *   hyprlax-ctl modify <id|all> <property> <value>
  *   hyprlax-ctl list
  *   hyprlax-ctl clear
  *   hyprlax-ctl status
+ *   hyprlax-ctl batch < commands.txt
+ *   hyprlax-ctl <command> \; <command> ...
  */
 
 #include <stdio.h>
@@ -34,14 +36,18 @@ static void print_usage(const char* prog) {
     printf("Usage:\n");
     printf("  %s add <image> [scale=N] [opacity=N] [x=N] [y=N] [z=N]\n", prog);
     printf("  %s remove|rm <id>\n", prog);
-    printf("  %s modify|mod <id> <property> <value>\n", prog);
+    printf("  %s modify|mod <id|all> <property> <value>\n", prog);
     printf("  %s list|ls\n", prog);
     printf("  %s clear\n", prog);
     printf("  %s status\n", prog);
+    printf("  %s batch             Read newline-separated commands from stdin\n", prog);
+    printf("  %s <cmd> \\; <cmd>    Send several commands in one message\n", prog);
     printf("\nExamples:\n");
     printf("  %s add /path/to/image.png scale=1.5 opacity=0.8\n", prog);
     printf("  %s modify 1 opacity 0.5\n", prog);
     printf("  %s remove 1\n", prog);
+    printf("  printf 'modify 1 opacity 0.5\\nmodify 2 opacity 0.5\\n' | %s batch\n", prog);
+    printf("  %s modify 1 opacity 0.5 \\; modify 2 opacity 0.5\n", prog);
 }
 
 int main(int argc, char** argv) {
@@ -50,6 +56,45 @@ int main(int argc, char** argv) {
         return 1;
     }
 
+    // Build the whole message before connecting: hyprlax reads it with a
+    // single recv() as soon as the connection is accepted
+    char command[IPC_MAX_MESSAGE_SIZE];
+    size_t offset = 0;
+
+    if (strcmp(argv[1], "batch") == 0) {
+        // Send every command from stdin in one round trip
+        offset = fread(command, 1, sizeof(command), stdin);
+        if (offset >= sizeof(command)) {
+            fprintf(stderr, "Batch too long (max %d bytes)\n", IPC_MAX_MESSAGE_SIZE - 1);
+            return 1;
+        }
+        if (offset == 0) {
+            fprintf(stderr, "No commands read from stdin\n");
+            return 1;
+        }
+        command[offset] = '\0';
+    } else {
+        // A standalone ';' argument separates commands, which are then sent
+        // together as newline-separated lines
+        int line_start = 1;
+        for (int i = 1; i < argc; i++) {
+            int written;
+            if (strcmp(argv[i], ";") == 0) {
+                written = snprintf(command + offset, sizeof(command) - offset, "\n");
+                line_start = 1;
+            } else {
+                written = snprintf(command + offset, sizeof(command) - offset,
+                                   "%s%s", (line_start ? "" : " "), argv[i]);
+                line_start = 0;
+            }
+            if (written < 0 || offset + (size_t)written >= sizeof(command)) {
+                fprintf(stderr, "Command too long\n");
+                return 1;
+            }
+            offset += (size_t)written;
+        }
+    }
+
     // Get socket path
     char socket_path[256];
     get_socket_path(socket_path, sizeof(socket_path));
@@ -74,21 +119,6 @@ int main(int argc, char** argv) {
         return 1;
     }
 
-    // Build command string
-    char command[IPC_MAX_MESSAGE_SIZE];
-    size_t offset = 0;
-
-    for (int i = 1; i < argc; i++) {
-        int written = snprintf(command + offset, sizeof(command) - offset,
-                               "%s%s", (i > 1 ? " " : ""), argv[i]);
-        if (written < 0 || offset + (size_t)written >= sizeof(command)) {
-            fprintf(stderr, "Command too long\n");
-            close(sock);
-            return 1;
-        }
-        offset += (size_t)written;
-    }
-
     // Send command
     if (send(sock, command, strlen(command), 0) < 0) {
         perror("Failed to send command");
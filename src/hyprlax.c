@@ -5,7 +5,10 @@
 #define BLUR_SHADER_MAX_SIZE 2048 // Maximum size for dynamically built shader
 #define BLUR_KERNEL_SIZE 5.0f    // Size of the blur kernel
 #define BLUR_WEIGHT_FALLOFF 0.15f // Weight falloff for blur samples
-#define BLUR_MIN_THRESHOLD 0.001f // Minimum blur amount to apply effect
+#define BLUR_MIN_VISIBLE 0.05f    // Minimum blur amount to apply effect (smaller spans under half a pixel)
+#define MIN_FRAME_MOVEMENT 0.0625f // Pixels a layer must move before a new frame is drawn
+#define ATTRIB_POSITION 0         // Vertex attribute slots, bound before linking
+#define ATTRIB_TEXCOORD 1         // so every program shares the same layout
 
 #include <stdio.h>
 #include <stdlib.h>
@@ -14,9 +17,11 @@
 #include <unistd.h>
 #include <sys/socket.h>
 #include <sys/un.h>
+#include <sys/time.h>
 #include <sys/wait.h>
 #include <fcntl.h>
 #include <poll.h>
+#include <signal.h>
 #include <time.h>
 #include <math.h>
 #include <errno.h>
@@ -64,6 +69,7 @@ struct layer {
     float current_offset;
     float target_offset;
     float start_offset;
+    float drawn_offset;      // current_offset as of the last presented frame
 
     // Phase 3: Advanced per-layer settings
     easing_type_t easing;    // Per-layer easing function
@@ -72,6 +78,9 @@ struct layer {
     double animation_start;  // When this layer's animation started
     int animating;          // Is this layer currently animating
     float blur_amount;      // Blur amount for depth (0.0 = no blur)
+    int hidden;             // Hidden via IPC (texture stays resident for re-show)
+    float x_offset;         // IPC pixel offset, applied by translating the quad
+    float y_offset;
 };
 
 // Configuration
@@ -149,6 +158,8 @@ struct {
     float current_offset;
     float target_offset;
     float start_offset;
+    float drawn_offset;  // current_offset as of the last presented frame
+    int force_redraw;    // Present the next frame even if nothing moved
     double animation_start;
     int animating;
     int current_workspace;
@@ -178,43 +189,61 @@ float apply_easing(float t, easing_type_t type) {
         case EASE_QUAD_OUT:
             return 1.0f - (1.0f - t) * (1.0f - t);
 
-        case EASE_CUBIC_OUT:
-            return 1.0f - powf(1.0f - t, 3.0f);
+        // Integer powers are expanded into products rather than going through powf()
+        case EASE_CUBIC_OUT: {
+            float u = 1.0f - t;
+            return 1.0f - u * u * u;
+        }
 
-        case EASE_QUART_OUT:
-            return 1.0f - powf(1.0f - t, 4.0f);
+        case EASE_QUART_OUT: {
+            float u = 1.0f - t;
+            float u2 = u * u;
+            return 1.0f - u2 * u2;
+        }
 
-        case EASE_QUINT_OUT:
-            return 1.0f - powf(1.0f - t, 5.0f);
+        case EASE_QUINT_OUT: {
+            float u = 1.0f - t;
+            float u2 = u * u;
+            return 1.0f - u2 * u2 * u;
+        }
 
         case EASE_SINE_OUT:
             return sinf((t * M_PI) / 2.0f);
 
         case EASE_EXPO_OUT:
-            return t == 1.0f ? 1.0f : 1.0f - powf(2.0f, -10.0f * t);
+            return t == 1.0f ? 1.0f : 1.0f - exp2f(-10.0f * t);
 
-        case EASE_CIRC_OUT:
-            return sqrtf(1.0f - powf(t - 1.0f, 2.0f));
+        case EASE_CIRC_OUT: {
+            float u = t - 1.0f;
+            return sqrtf(1.0f - u * u);
+        }
 
         case EASE_BACK_OUT: {
             float c1 = 1.70158f;
             float c3 = c1 + 1.0f;
-            return 1.0f + c3 * powf(t - 1.0f, 3.0f) + c1 * powf(t - 1.0f, 2.0f);
+            float u = t - 1.0f;
+            float u2 = u * u;
+            return 1.0f + c3 * u2 * u + c1 * u2;
         }
 
         case EASE_ELASTIC_OUT: {
             float c4 = (2.0f * M_PI) / 3.0f;
-            return t == 0 ? 0 : t == 1 ? 1 : powf(2.0f, -10.0f * t) * sinf((t * 10.0f - 0.75f) * c4) + 1.0f;
+            return t == 0 ? 0 : t == 1 ? 1 : exp2f(-10.0f * t) * sinf((t * 10.0f - 0.75f) * c4) + 1.0f;
         }
 
         case EASE_CUSTOM_SNAP: {
             // Custom extra snappy easing - fast start, very quick deceleration at the end
             if (t < 0.4f) {
                 // Accelerate quickly for first 40% of time
-                return 1.0f - powf(1.0f - (t * 2.5f), 6.0f);
+                float u = 1.0f - (t * 2.5f);
+                float u3 = u * u * u;
+                return 1.0f - u3 * u3;
             } else {
                 // Then ease out more gently
-                return 1.0f - powf(1.0f - t, 8.0f);
+                float u = 1.0f - t;
+                float u2 = u * u;
+                float u4 = u2 * u2;
+                return 1.0f - u4 * u4;
             }
         }
 
@@ -223,6 +252,40 @@ float apply_easing(float t, easing_type_t type) {
     }
 }
 
+// Easing names accepted on the command line, in layer specs and config files
+static const struct {
+    const char *name;
+    easing_type_t type;
+} easing_names[] = {
+    {"linear", EASE_LINEAR},
+    {"quad", EASE_QUAD_OUT},
+    {"cubic", EASE_CUBIC_OUT},
+    {"quart", EASE_QUART_OUT},
+    {"quint", EASE_QUINT_OUT},
+    {"sine", EASE_SINE_OUT},
+    {"expo", EASE_EXPO_OUT},
+    {"circ", EASE_CIRC_OUT},
+    {"back", EASE_BACK_OUT},
+    {"elastic", EASE_ELASTIC_OUT},
+    {"snap", EASE_CUSTOM_SNAP},
+};
+
+// Look up an easing by name; leaves *out untouched for unknown names
+int parse_easing(const char *name, easing_type_t *out) {
+    if (!name || !out) {
+        return -1;
+    }
+
+    for (size_t i = 0; i < sizeof(easing_names) / sizeof(easing_names[0]); i++) {
+        if (strcmp(name, easing_names[i].name) == 0) {
+            *out = easing_names[i].type;
+            return 0;
+        }
+    }
+
+    return -1;
+}
+
 // Shader sources with better precision
 const char *vertex_shader_src =
     "precision highp float;\n"
@@ -265,30 +328,21 @@ char *build_blur_shader() {
         "uniform vec2 u_resolution;\n"
         "void main() {\n"
         "    float blur = u_blur_amount;\n"
-        "    if (blur < %.4f) {\n"  // BLUR_MIN_THRESHOLD
-        "        vec4 color = texture2D(u_texture, v_texcoord);\n"
-        "        gl_FragColor = vec4(color.rgb, color.a * u_opacity);\n"
-        "        return;\n"
-        "    }\n"
-        "    \n"
-        "    // DEBUG: Make blur effect super obvious by tinting red AND blurring\n"
-        "    vec2 texelSize = 1.0 / u_resolution;\n"
+        "    // 5x5 taps spanning +/-10 blur steps. The LOD bias reads a smaller\n"
+        "    // mip level so each tap already averages its share of the kernel\n"
+        "    vec2 tap_step = blur * 5.0 / u_resolution;\n"
+        "    float bias = log2(max(blur * 5.0, 1.0));\n"
         "    vec4 result = vec4(0.0);\n"
-        "    float samples = 0.0;\n"
         "    \n"
-        "    // Large blur radius for testing\n"
-        "    for (float x = -10.0; x <= 10.0; x += 2.0) {\n"
-        "        for (float y = -10.0; y <= 10.0; y += 2.0) {\n"
-        "            vec2 offset = vec2(x, y) * texelSize * blur;\n"
-        "            result += texture2D(u_texture, v_texcoord + offset);\n"
-        "            samples += 1.0;\n"
+        "    for (float x = -2.0; x <= 2.0; x += 1.0) {\n"
+        "        for (float y = -2.0; y <= 2.0; y += 1.0) {\n"
+        "            result += texture2D(u_texture, v_texcoord + vec2(x, y) * tap_step, bias);\n"
         "        }\n"
         "    }\n"
         "    \n"
-        "    result /= samples;\n"
+        "    result *= 1.0 / 25.0;\n"
         "    gl_FragColor = vec4(result.rgb, result.a * u_opacity);\n"
-        "}\n",
-        BLUR_MIN_THRESHOLD);
+        "}\n");
 
     // Check if formatting failed first
     if (written < 0) {
@@ -345,6 +399,8 @@ int init_gl() {
     state.shader_program = glCreateProgram();
     glAttachShader(state.shader_program, vertex_shader);
     glAttachShader(state.shader_program, fragment_shader);
+    glBindAttribLocation(state.shader_program, ATTRIB_POSITION, "position");
+    glBindAttribLocation(state.shader_program, ATTRIB_TEXCOORD, "texcoord");
     glLinkProgram(state.shader_program);
 
     GLint status;
@@ -379,6 +435,8 @@ int init_gl() {
     }
     glAttachShader(state.blur_shader_program, vertex_shader);
     glAttachShader(state.blur_shader_program, blur_fragment);
+    glBindAttribLocation(state.blur_shader_program, ATTRIB_POSITION, "position");
+    glBindAttribLocation(state.blur_shader_program, ATTRIB_TEXCOORD, "texcoord");
     glLinkProgram(state.blur_shader_program);
 
     glGetProgramiv(state.blur_shader_program, GL_LINK_STATUS, &status);
@@ -407,6 +465,8 @@ int init_gl() {
     if (state.u_opacity == -1) {
         fprintf(stderr, "Warning: Failed to find uniform 'u_opacity' in standard shader\n");
     }
+    // Every layer samples from texture unit 0, so the sampler is set once here
+    glUniform1i(state.u_texture, 0);
 
     // Get uniform locations for blur shader with error checking
     glUseProgram(state.blur_shader_program);
@@ -426,6 +486,7 @@ int init_gl() {
     if (state.blur_u_resolution == -1) {
         fprintf(stderr, "Warning: Failed to find uniform 'u_resolution' in blur shader\n");
     }
+    glUniform1i(state.blur_u_texture, 0);
     
     if (config.debug) {
         fprintf(stderr, "Blur shader uniform locations: texture=%d, opacity=%d, blur_amount=%d, resolution=%d\n",
@@ -444,10 +505,19 @@ int init_gl() {
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, state.ebo);
     glBufferData(GL_ELEMENT_ARRAY_BUFFER, sizeof(indices), indices, GL_STATIC_DRAW);
 
+    // Allocate vertex storage once (one quad: 4 vertices x pos/texcoord);
+    // render_frame() only overwrites the contents with glBufferSubData
+    glBindBuffer(GL_ARRAY_BUFFER, state.vbo);
+    glBufferData(GL_ARRAY_BUFFER, 16 * sizeof(float), NULL, GL_DYNAMIC_DRAW);
+
     // Disable depth testing and blending for better performance
     glDisable(GL_DEPTH_TEST);
     glDisable(GL_BLEND);
 
+    // Mip levels are only used for minification and the blur LOD bias,
+    // so let the driver pick its cheapest glGenerateMipmap path
+    glHint(GL_GENERATE_MIPMAP_HINT, GL_FASTEST);
+
     return 0;
 }
 
@@ -499,37 +569,73 @@ int load_image(const char *path) {
     return 0;
 }
 
+// Find another loaded layer whose texture was decoded from the same image
+static struct layer *find_loaded_image(const struct layer *self, const char *path) {
+    for (int i = 0; i < state.layer_count; i++) {
+        struct layer *other = &state.layers[i];
+        if (other != self && other->texture && other->image_path &&
+            strcmp(other->image_path, path) == 0) {
+            return other;
+        }
+    }
+    return NULL;
+}
+
+// Whether a layer other than idx still draws from layer idx's texture.
+// Slots after idx are still live; earlier slots that have been marked for
+// removal (opacity < 0) no longer count.
+static int layer_texture_shared(int idx) {
+    GLuint texture = state.layers[idx].texture;
+    for (int i = 0; i < state.layer_count; i++) {
+        if (i == idx || state.layers[i].texture != texture) continue;
+        if (i > idx || state.layers[i].opacity >= 0.0f) return 1;
+    }
+    return 0;
+}
+
 // Load image as layer for multi-layer mode
 int load_layer(struct layer *layer, const char *path, float shift_multiplier, float opacity, float blur_amount) {
-    int channels;
-    unsigned char *data = stbi_load(path, &layer->width, &layer->height, &channels, 4);
-    if (!data) {
-        fprintf(stderr, "Failed to load layer image '%s': %s\n", path, stbi_failure_reason());
-        return -1;
-    }
+    unsigned char *data = NULL;
+
+    // Layers using the same image share one texture instead of decoding
+    // and uploading it again
+    struct layer *shared = find_loaded_image(layer, path);
+    if (shared) {
+        layer->texture = shared->texture;
+        layer->width = shared->width;
+        layer->height = shared->height;
+    } else {
+        int channels;
+        data = stbi_load(path, &layer->width, &layer->height, &channels, 4);
+        if (!data) {
+            fprintf(stderr, "Failed to load layer image '%s': %s\n", path, stbi_failure_reason());
+            return -1;
+        }
 
-    glGenTextures(1, &layer->texture);
-    glBindTexture(GL_TEXTURE_2D, layer->texture);
-    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, layer->width, layer->height, 0, GL_RGBA, GL_UNSIGNED_BYTE, data);
+        glGenTextures(1, &layer->texture);
+        glBindTexture(GL_TEXTURE_2D, layer->texture);
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, layer->width, layer->height, 0, GL_RGBA, GL_UNSIGNED_BYTE, data);
 
-    // Use trilinear filtering for smoother animation
-    glGenerateMipmap(GL_TEXTURE_2D);
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR);
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR);
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE);
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE);
+        // Use trilinear filtering for smoother animation
+        glGenerateMipmap(GL_TEXTURE_2D);
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR);
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR);
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE);
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE);
+    }
 
     layer->shift_multiplier = shift_multiplier;
     layer->opacity = opacity;
     layer->image_path = strdup(path);
     if (!layer->image_path) {
         fprintf(stderr, "Error: Failed to allocate memory for image path\n");
-        stbi_image_free(data);
+        if (data) stbi_image_free(data);
         return -1;
     }
     layer->current_offset = 0.0f;
     layer->target_offset = 0.0f;
     layer->start_offset = 0.0f;
+    layer->drawn_offset = 0.0f;
 
     // Initialize Phase 3 fields with defaults
     layer->easing = config.easing;  // Use global easing by default
@@ -538,12 +644,16 @@ int load_layer(struct layer *layer, const char *path, float shift_multiplier, fl
     layer->animation_start = 0.0;
     layer->animating = 0;
     layer->blur_amount = blur_amount;
+    layer->hidden = 0;
+    layer->x_offset = 0.0f;
+    layer->y_offset = 0.0f;
 
-    stbi_image_free(data);
+    if (data) stbi_image_free(data);
 
     if (config.debug) {
-        printf("Loaded layer: %s (%.0fx%.0f) shift=%.2f opacity=%.2f\n",
-               path, (float)layer->width, (float)layer->height, shift_multiplier, opacity);
+        printf("Loaded layer: %s (%.0fx%.0f) shift=%.2f opacity=%.2f%s\n",
+               path, (float)layer->width, (float)layer->height, shift_multiplier, opacity,
+               shared ? " [shared texture]" : "");
     }
 
     return 0;
@@ -577,7 +687,7 @@ void sync_ipc_layers() {
     // Process IPC layers
     for (int i = 0; i < state.ipc_ctx->layer_count; i++) {
         layer_t* ipc_layer = state.ipc_ctx->layers[i];
-        if (!ipc_layer || !ipc_layer->visible) continue;
+        if (!ipc_layer) continue;
 
         // Find existing layer with same path
         struct layer* existing = NULL;
@@ -590,11 +700,14 @@ void sync_ipc_layers() {
         }
 
         if (existing) {
-            // Update existing layer
+            // Update existing layer; hidden layers keep their texture so
+            // showing them again does not re-read and re-decode the image
             existing->opacity = ipc_layer->opacity;
             existing->shift_multiplier = ipc_layer->scale;
-            // TODO: Apply x/y offsets when rendering
-        } else {
+            existing->hidden = !ipc_layer->visible;
+            existing->x_offset = ipc_layer->x_offset;
+            existing->y_offset = ipc_layer->y_offset;
+        } else if (ipc_layer->visible) {
             // Add new layer
             if (state.layer_count >= state.max_layers) {
                 // Expand layer array
@@ -612,6 +725,8 @@ void sync_ipc_layers() {
                 struct layer* new_layer = &state.layers[state.layer_count];
                 if (load_layer(new_layer, ipc_layer->image_path,
                               ipc_layer->scale, ipc_layer->opacity, 0.0f) == 0) {
+                    new_layer->x_offset = ipc_layer->x_offset;
+                    new_layer->y_offset = ipc_layer->y_offset;
                     new_layer->image_path = strdup(ipc_layer->image_path);
                     state.layer_count++;
                 }
@@ -629,8 +744,8 @@ void sync_ipc_layers() {
             }
             write_idx++;
         } else {
-            // Remove this layer
-            if (state.layers[read_idx].texture) {
+            // Remove this layer, keeping a texture other layers still use
+            if (state.layers[read_idx].texture && !layer_texture_shared(read_idx)) {
                 glDeleteTextures(1, &state.layers[read_idx].texture);
             }
             if (state.layers[read_idx].image_path) {
@@ -684,6 +799,26 @@ int add_layer(const char *path, float shift_multiplier, float opacity) {
 // Forward declaration
 void render_frame();
 
+// Seconds until an animation actually starts moving (0 if one already is)
+static double time_until_motion(double now) {
+    if (!config.multi_layer_mode) {
+        // animation_start already includes the configured delay
+        double wait = state.animation_start - now;
+        return wait > 0 ? wait : 0;
+    }
+
+    double wait = -1;
+    for (int i = 0; i < state.layer_count; i++) {
+        struct layer *layer = &state.layers[i];
+        if (!layer->animating) continue;
+
+        double remaining = layer->animation_start + layer->animation_delay - now;
+        if (remaining <= 0) return 0;
+        if (wait < 0 || remaining < wait) wait = remaining;
+    }
+    return wait > 0 ? wait : 0;
+}
+
 // Frame callback for smooth animation
 static void frame_done(void *data, struct wl_callback *callback, uint32_t time) {
     (void)data;
@@ -691,6 +826,10 @@ static void frame_done(void *data, struct wl_callback *callback, uint32_t time)
     if (callback) wl_callback_destroy(callback);
     state.frame_callback = NULL;
 
+    // Nothing moves until the delay ends; the main loop wakes up for it.
+    // A forced redraw (e.g. an IPC opacity change) still shows right away.
+    if (!state.force_redraw && time_until_motion(get_time()) > 0) return;
+
     // Render the next frame
     render_frame();
 }
@@ -699,6 +838,23 @@ static const struct wl_callback_listener frame_listener = {
     .done = frame_done
 };
 
+// Whether any offset has moved far enough since the last presented frame
+// to change the picture. Compared against the last drawn offset rather than
+// the previous tick, so slow movement accumulates instead of being lost.
+static int offsets_moved_visibly(void) {
+    if (!config.multi_layer_mode) {
+        return fabsf(state.current_offset - state.drawn_offset) >= MIN_FRAME_MOVEMENT;
+    }
+    for (int i = 0; i < state.layer_count; i++) {
+        struct layer *layer = &state.layers[i];
+        if (!layer->hidden &&
+            fabsf(layer->current_offset - layer->drawn_offset) >= MIN_FRAME_MOVEMENT) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
 // Render frame with optimizations
 void render_frame() {
     // Don't render if OpenGL isn't initialized yet
@@ -757,58 +913,87 @@ void render_frame() {
         }
     }
 
+    // Mid-animation ticks that move nothing visibly (the long tail of expo or
+    // quint easing) skip drawing and presenting; the main loop keeps ticking,
+    // and the final frame of an animation is always drawn
+    if (state.animating && !state.force_redraw && !offsets_moved_visibly()) {
+        state.last_frame_time = current_time;
+        return;
+    }
+    state.force_redraw = 0;
+    state.drawn_offset = state.current_offset;
+    for (int i = 0; i < state.layer_count; i++) {
+        state.layers[i].drawn_offset = state.layers[i].current_offset;
+    }
+
     // Clear
     glClear(GL_COLOR_BUFFER_BIT);
 
-    // Enable blending for multi-layer mode
+    // Blending for multi-layer mode is switched on per layer below
     if (config.multi_layer_mode && state.layer_count > 1) {
-        glEnable(GL_BLEND);
         // Use blend function for premultiplied alpha
         glBlendFunc(GL_ONE, GL_ONE_MINUS_SRC_ALPHA);
     }
 
-    // Get attribute locations once
-    GLint pos_attrib = glGetAttribLocation(state.shader_program, "position");
-    GLint tex_attrib = glGetAttribLocation(state.shader_program, "texcoord");
+    // Attribute slots are fixed at link time, no per-frame lookup needed
+    GLint pos_attrib = ATTRIB_POSITION;
+    GLint tex_attrib = ATTRIB_TEXCOORD;
 
     if (config.multi_layer_mode) {
+        // Viewport to texture mapping is the same for every layer this frame
+        float viewport_width_in_texture = 1.0f / config.scale_factor;
+        float max_texture_offset = 1.0f - viewport_width_in_texture;
+        float max_pixel_offset = (config.scale_factor - 1.0f) * state.width;
+        float pixel_to_texture = max_pixel_offset > 0 ? max_texture_offset / max_pixel_offset : 0.0f;
+        float pixel_to_ndc_x = state.width > 0 ? 2.0f / state.width : 0.0f;
+        float pixel_to_ndc_y = state.height > 0 ? -2.0f / state.height : 0.0f;
+
+        // Every layer draws the same quad layout from the same buffers, so
+        // bindings and attribute pointers are set up once per frame; only
+        // the vertex contents change per layer
+        glBindBuffer(GL_ARRAY_BUFFER, state.vbo);
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, state.ebo);
+        glVertexAttribPointer(pos_attrib, 2, GL_FLOAT, GL_FALSE, 4 * sizeof(float), (void*)0);
+        glEnableVertexAttribArray(pos_attrib);
+        glVertexAttribPointer(tex_attrib, 2, GL_FLOAT, GL_FALSE, 4 * sizeof(float), (void*)(2 * sizeof(float)));
+        glEnableVertexAttribArray(tex_attrib);
+
         // Render each layer
+        int drawn = 0;
+        GLuint current_program = 0;
         for (int i = 0; i < state.layer_count; i++) {
             struct layer *layer = &state.layers[i];
-
-            // Calculate layer-specific texture offset
-            float viewport_width_in_texture = 1.0f / config.scale_factor;
-            float max_texture_offset = 1.0f - viewport_width_in_texture;
-            float max_pixel_offset = (config.scale_factor - 1.0f) * state.width;
-            float tex_offset = 0.0f;
-
-            if (max_pixel_offset > 0) {
-                tex_offset = (layer->current_offset / max_pixel_offset) * max_texture_offset;
+            if (layer->hidden) continue;
+
+            // The bottom layer lands on the cleared (all-zero) framebuffer,
+            // where blending is an identity, so it skips the read-modify-write
+            if (drawn == 0) {
+                glDisable(GL_BLEND);
+            } else if (drawn == 1) {
+                glEnable(GL_BLEND);
             }
+            drawn++;
 
-            // Clamp to valid range
-            if (tex_offset > max_texture_offset) tex_offset = max_texture_offset;
-            if (tex_offset < 0.0f) tex_offset = 0.0f;
+            // Calculate layer-specific texture offset, clamped to valid range
+            float tex_offset = fmaxf(0.0f, fminf(layer->current_offset * pixel_to_texture,
+                                                 max_texture_offset));
+
+            // Position changes only translate the quad, the texture is untouched
+            float dx = layer->x_offset * pixel_to_ndc_x;
+            float dy = layer->y_offset * pixel_to_ndc_y;
 
             // Update vertex buffer for this layer
             float vertices[] = {
-                -1.0f, -1.0f,  tex_offset, 1.0f,
-                 1.0f, -1.0f,  tex_offset + viewport_width_in_texture, 1.0f,
-                 1.0f,  1.0f,  tex_offset + viewport_width_in_texture, 0.0f,
-                -1.0f,  1.0f,  tex_offset, 0.0f,
+                -1.0f + dx, -1.0f + dy,  tex_offset, 1.0f,
+                 1.0f + dx, -1.0f + dy,  tex_offset + viewport_width_in_texture, 1.0f,
+                 1.0f + dx,  1.0f + dy,  tex_offset + viewport_width_in_texture, 0.0f,
+                -1.0f + dx,  1.0f + dy,  tex_offset, 0.0f,
             };
 
-            glBindBuffer(GL_ARRAY_BUFFER, state.vbo);
-            glBufferData(GL_ARRAY_BUFFER, sizeof(vertices), vertices, GL_DYNAMIC_DRAW);
-
-            // Set up vertex attributes
-            glVertexAttribPointer(pos_attrib, 2, GL_FLOAT, GL_FALSE, 4 * sizeof(float), (void*)0);
-            glEnableVertexAttribArray(pos_attrib);
-            glVertexAttribPointer(tex_attrib, 2, GL_FLOAT, GL_FALSE, 4 * sizeof(float), (void*)(2 * sizeof(float)));
-            glEnableVertexAttribArray(tex_attrib);
+            glBufferSubData(GL_ARRAY_BUFFER, 0, sizeof(vertices), vertices);
 
             // Select shader based on blur amount
-            if (layer->blur_amount > BLUR_MIN_THRESHOLD && state.blur_shader_program != 0) {
+            if (layer->blur_amount >= BLUR_MIN_VISIBLE && state.blur_shader_program != 0) {
                 if (config.debug) {
                     static int blur_count = 0;
                     if (blur_count++ < 5) {  // Only print first 5 times to avoid spam
@@ -816,26 +1001,31 @@ void render_frame() {
                                 i, layer->blur_amount);
                     }
                 }
-                glUseProgram(state.blur_shader_program);
+                // Program switches are costly; consecutive layers sharing a
+                // shader reuse it along with its per-frame resolution uniform
+                if (current_program != state.blur_shader_program) {
+                    glUseProgram(state.blur_shader_program);
+                    glUniform2f(state.blur_u_resolution, (float)state.width, (float)state.height);
+                    current_program = state.blur_shader_program;
+                }
 
                 // Bind layer texture and set uniforms using pre-cached locations
                 glBindTexture(GL_TEXTURE_2D, layer->texture);
-                glUniform1i(state.blur_u_texture, 0);
                 glUniform1f(state.blur_u_opacity, layer->opacity);
                 glUniform1f(state.blur_u_blur_amount, layer->blur_amount);
-                glUniform2f(state.blur_u_resolution, (float)state.width, (float)state.height);
                 
             } else {
-                glUseProgram(state.shader_program);
+                if (current_program != state.shader_program) {
+                    glUseProgram(state.shader_program);
+                    current_program = state.shader_program;
+                }
 
                 // Bind layer texture and set uniforms
                 glBindTexture(GL_TEXTURE_2D, layer->texture);
-                glUniform1i(state.u_texture, 0);
                 glUniform1f(state.u_opacity, layer->opacity);
             }
 
             // Draw layer
-            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, state.ebo);
             glDrawElements(GL_TRIANGLES, 6, GL_UNSIGNED_SHORT, 0);
         }
     } else {
@@ -849,8 +1039,7 @@ void render_frame() {
             tex_offset = (state.current_offset / max_pixel_offset) * max_texture_offset;
         }
 
-        if (tex_offset > max_texture_offset) tex_offset = max_texture_offset;
-        if (tex_offset < 0.0f) tex_offset = 0.0f;
+        tex_offset = fmaxf(0.0f, fminf(tex_offset, max_texture_offset));
 
         float vertices[] = {
             -1.0f, -1.0f,  tex_offset, 1.0f,
@@ -860,7 +1049,7 @@ void render_frame() {
         };
 
         glBindBuffer(GL_ARRAY_BUFFER, state.vbo);
-        glBufferData(GL_ARRAY_BUFFER, sizeof(vertices), vertices, GL_DYNAMIC_DRAW);
+        glBufferSubData(GL_ARRAY_BUFFER, 0, sizeof(vertices), vertices);
 
         glVertexAttribPointer(pos_attrib, 2, GL_FLOAT, GL_FALSE, 4 * sizeof(float), (void*)0);
         glEnableVertexAttribArray(pos_attrib);
@@ -869,7 +1058,6 @@ void render_frame() {
 
         // Bind single texture
         glBindTexture(GL_TEXTURE_2D, state.texture);
-        glUniform1i(state.u_texture, 0);
         glUniform1f(state.u_opacity, 1.0f);
 
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, state.ebo);
@@ -904,25 +1092,68 @@ void render_frame() {
     state.last_frame_time = current_time;
 }
 
-// Get the maximum workspace number from Hyprland
-int detect_max_workspaces() {
-    // Using fork/exec for better security than popen
-    // This avoids shell injection vulnerabilities
-    int pipefd[2];
-    pid_t pid;
+// Build the path of one of Hyprland's sockets (.socket.sock or .socket2.sock)
+static int hyprland_socket_path(char *buffer, size_t size, const char *name) {
+    const char *sig = getenv("HYPRLAND_INSTANCE_SIGNATURE");
+    if (!sig) return -1;
+
+    const char *runtime_dir = getenv("XDG_RUNTIME_DIR");
+    if (!runtime_dir) {
+        runtime_dir = "/run/user/1000";
+    }
+
+    int written = snprintf(buffer, size, "%s/hypr/%s/%s", runtime_dir, sig, name);
+    return (written < 0 || (size_t)written >= size) ? -1 : 0;
+}
+
+// Send a request to Hyprland's request socket and return a stream over the
+// reply, which is the same text `hyprctl <request>` prints. Returns NULL if
+// the socket is unreachable.
+static FILE *hyprland_query(const char *request) {
+    char socket_path[256];
+    if (hyprland_socket_path(socket_path, sizeof(socket_path), ".socket.sock") < 0) {
+        return NULL;
+    }
+
+    int fd = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (fd < 0) return NULL;
 
+    // Don't let a wedged compositor stall startup
+    struct timeval timeout = {1, 0};
+    setsockopt(fd, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
+
+    struct sockaddr_un addr = {0};
+    addr.sun_family = AF_UNIX;
+    strncpy(addr.sun_path, socket_path, sizeof(addr.sun_path) - 1);
+
+    if (connect(fd, (struct sockaddr*)&addr, sizeof(addr)) < 0 ||
+        write(fd, request, strlen(request)) < 0) {
+        close(fd);
+        return NULL;
+    }
+
+    FILE *fp = fdopen(fd, "r");
+    if (!fp) close(fd);
+    return fp;
+}
+
+// Run `hyprctl <request>` without a shell (fork/exec rather than popen, to
+// avoid shell injection) and return a stream over its output. *pid receives
+// the child to reap once the stream is closed.
+static FILE *hyprctl_spawn(const char *request, pid_t *pid) {
+    int pipefd[2];
     if (pipe(pipefd) == -1) {
-        return 10; // Default fallback
+        return NULL;
     }
 
-    pid = fork();
-    if (pid == -1) {
+    *pid = fork();
+    if (*pid == -1) {
         close(pipefd[0]);
         close(pipefd[1]);
-        return 10; // Default fallback
+        return NULL;
     }
 
-    if (pid == 0) {
+    if (*pid == 0) {
         // Child process
         close(pipefd[0]); // Close read end
         dup2(pipefd[1], STDOUT_FILENO);
@@ -930,7 +1161,7 @@ int detect_max_workspaces() {
         close(pipefd[1]);
 
         // Execute hyprctl directly without shell
-        char *args[] = {"hyprctl", "workspaces", NULL};
+        char *args[] = {"hyprctl", (char *)request, NULL};
         execvp("hyprctl", args);
 
         // If exec fails, exit child
@@ -943,8 +1174,35 @@ int detect_max_workspaces() {
     FILE *fp = fdopen(pipefd[0], "r");
     if (!fp) {
         close(pipefd[0]);
-        waitpid(pid, NULL, 0);
-        return 10;
+        waitpid(*pid, NULL, 0);
+        return NULL;
+    }
+    return fp;
+}
+
+// Open the reply to a Hyprland request. The request socket is tried first;
+// hyprctl is only spawned when it is unreachable, in which case *pid is set
+// to the child that hyprland_request_close() reaps.
+static FILE *hyprland_request(const char *request, pid_t *pid) {
+    *pid = -1;
+    FILE *fp = hyprland_query(request);
+    if (!fp) {
+        fp = hyprctl_spawn(request, pid);
+    }
+    return fp;
+}
+
+static void hyprland_request_close(FILE *fp, pid_t pid) {
+    fclose(fp);
+    if (pid > 0) waitpid(pid, NULL, 0);
+}
+
+// Get the maximum workspace number from Hyprland
+int detect_max_workspaces() {
+    pid_t pid;
+    FILE *fp = hyprland_request("workspaces", &pid);
+    if (!fp) {
+        return 10; // Default fallback
     }
 
     char buffer[256];
@@ -963,8 +1221,7 @@ int detect_max_workspaces() {
             }
         }
     }
-    fclose(fp);
-    waitpid(pid, NULL, 0);
+    hyprland_request_close(fp, pid);
 
     if (max_ws > 0) {
         // Always use at least 10 workspaces to avoid breaking parallax
@@ -978,36 +1235,8 @@ int detect_max_workspaces() {
     }
 
     // Try to check bindings as fallback (simpler parsing)
-    if (pipe(pipefd) == -1) {
-        return 10;
-    }
-
-    pid = fork();
-    if (pid == -1) {
-        close(pipefd[0]);
-        close(pipefd[1]);
-        return 10;
-    }
-
-    if (pid == 0) {
-        // Child process
-        close(pipefd[0]);
-        dup2(pipefd[1], STDOUT_FILENO);
-        dup2(pipefd[1], STDERR_FILENO);
-        close(pipefd[1]);
-
-        char *args[] = {"hyprctl", "binds", NULL};
-        execvp("hyprctl", args);
-        _exit(1);
-    }
-
-    // Parent process
-    close(pipefd[1]);
-
-    fp = fdopen(pipefd[0], "r");
+    fp = hyprland_request("binds", &pid);
     if (!fp) {
-        close(pipefd[0]);
-        waitpid(pid, NULL, 0);
         return 10;
     }
 
@@ -1020,22 +1249,21 @@ int detect_max_workspaces() {
             // Try to extract workspace number
             int ws_num = 0;
             char *ws_str = strstr(buffer, "workspace,");
-                if (ws_str && sscanf(ws_str, "workspace, %d", &ws_num) == 1) {
-                    if (ws_num > max_ws && ws_num <= 20) {  // Sanity check
-                        max_ws = ws_num;
-                    }
+            if (ws_str && sscanf(ws_str, "workspace, %d", &ws_num) == 1) {
+                if (ws_num > max_ws && ws_num <= 20) {  // Sanity check
+                    max_ws = ws_num;
                 }
             }
         }
-        fclose(fp);
-        waitpid(pid, NULL, 0);
+    }
+    hyprland_request_close(fp, pid);
 
-        if (max_ws > 0) {
-            if (config.debug) {
-                printf("Detected max workspace from bindings: %d\n", max_ws);
-            }
-            return max_ws;
+    if (max_ws > 0) {
+        if (config.debug) {
+            printf("Detected max workspace from bindings: %d\n", max_ws);
         }
+        return max_ws;
+    }
 
     // Default to 10 workspaces if we can't detect
     if (config.debug) {
@@ -1046,20 +1274,12 @@ int detect_max_workspaces() {
 
 // Connect to Hyprland IPC
 int connect_hyprland_ipc() {
-    const char *sig = getenv("HYPRLAND_INSTANCE_SIGNATURE");
-    if (!sig) {
+    char socket_path[256];
+    if (hyprland_socket_path(socket_path, sizeof(socket_path), ".socket2.sock") < 0) {
         fprintf(stderr, "Not running under Hyprland\n");
         return -1;
     }
 
-    const char *runtime_dir = getenv("XDG_RUNTIME_DIR");
-    if (!runtime_dir) {
-        runtime_dir = "/run/user/1000";
-    }
-
-    char socket_path[256];
-    snprintf(socket_path, sizeof(socket_path), "%s/hypr/%s/.socket2.sock", runtime_dir, sig);
-
     state.ipc_fd = socket(AF_UNIX, SOCK_STREAM, 0);
     if (state.ipc_fd < 0) return -1;
 
@@ -1086,72 +1306,77 @@ void process_ipc_events() {
     if (n > 0) {
         buffer[n] = '\0';
 
-        // Parse workspace events
+        // Parse workspace events. A burst of switches (e.g. scrolling across
+        // workspaces) can arrive in one read; only the last one decides where
+        // the animation heads, so restart it once instead of once per event
+        int workspace = 0;
         char *line = strtok(buffer, "\n");
         while (line) {
             if (strncmp(line, "workspace>>", 11) == 0) {
-                int workspace = atoi(line + 11);
-
-                // Only animate if this is a real workspace change
-                if (workspace != state.current_workspace && workspace > 0) {
-                    if (config.multi_layer_mode) {
-                        // Multi-layer mode: update each layer's animation state
-                        double now = get_time();
-
-                        // Set new targets for each layer with individual timing
-                        float base_target = (workspace - 1) * config.shift_per_workspace;
-                        for (int i = 0; i < state.layer_count; i++) {
-                            struct layer *layer = &state.layers[i];
-
-                            // If currently animating, update current position
-                            if (layer->animating) {
-                                double elapsed = now - layer->animation_start - layer->animation_delay;
-                                if (elapsed > 0) {
-                                    float t = fminf(elapsed / layer->animation_duration, 1.0f);
-                                    float eased = apply_easing(t, layer->easing);
-                                    layer->current_offset = layer->start_offset +
-                                        (layer->target_offset - layer->start_offset) * eased;
-                                }
-                            }
-
-                            // Set new animation parameters
-                            layer->start_offset = layer->current_offset;
-                            layer->target_offset = base_target * layer->shift_multiplier;
-                            layer->animation_start = now;
-                            layer->animating = 1;
-                        }
-                    } else {
-                        // Single layer mode (backward compatible)
-                        if (state.animating) {
-                            double elapsed = get_time() - state.animation_start;
-                            float t = fminf(elapsed / config.animation_duration, 1.0f);
-                            float eased = apply_easing(t, config.easing);
-                            state.current_offset = state.start_offset + (state.target_offset - state.start_offset) * eased;
-                        }
+                int id = atoi(line + 11);
+                if (id > 0) workspace = id;
+            }
+            line = strtok(NULL, "\n");
+        }
 
-                        state.start_offset = state.current_offset;
-                        state.target_offset = (workspace - 1) * config.shift_per_workspace;
+        // Only animate if this is a real workspace change
+        if (workspace > 0 && workspace != state.current_workspace) {
+            // Sample the clock once; every timing below derives from it
+            double now = get_time();
+
+            if (config.multi_layer_mode) {
+                // Multi-layer mode: update each layer's animation state
+                // Set new targets for each layer with individual timing
+                float base_target = (workspace - 1) * config.shift_per_workspace;
+                for (int i = 0; i < state.layer_count; i++) {
+                    struct layer *layer = &state.layers[i];
+
+                    // If currently animating, update current position
+                    if (layer->animating) {
+                        double elapsed = now - layer->animation_start - layer->animation_delay;
+                        if (elapsed > 0) {
+                            float t = fminf(elapsed / layer->animation_duration, 1.0f);
+                            float eased = apply_easing(t, layer->easing);
+                            layer->current_offset = layer->start_offset +
+                                (layer->target_offset - layer->start_offset) * eased;
+                        }
                     }
 
-                    state.animation_start = get_time() + config.animation_delay;
-                    state.animating = 1;
-                    state.previous_workspace = state.current_workspace;  // Track the previous workspace
-                    state.current_workspace = workspace;
+                    // Set new animation parameters
+                    layer->start_offset = layer->current_offset;
+                    layer->target_offset = base_target * layer->shift_multiplier;
+                    layer->animation_start = now;
+                    layer->animating = 1;
+                }
+            } else {
+                // Single layer mode (backward compatible)
+                if (state.animating) {
+                    double elapsed = now - state.animation_start;
+                    float t = fminf(elapsed / config.animation_duration, 1.0f);
+                    float eased = apply_easing(t, config.easing);
+                    state.current_offset = state.start_offset + (state.target_offset - state.start_offset) * eased;
+                }
 
-                    if (config.debug) {
-                        printf("Workspace changed to %d (offset: %.2f -> %.2f)\n",
-                               workspace, state.start_offset, state.target_offset);
-                    }
+                state.start_offset = state.current_offset;
+                state.target_offset = (workspace - 1) * config.shift_per_workspace;
+            }
 
-                    // Request frame
-                    if (!state.frame_callback) {
-                        state.frame_callback = wl_surface_frame(state.surface);
-                        wl_callback_add_listener(state.frame_callback, &frame_listener, NULL);
-                        wl_surface_commit(state.surface);
-                    }
-                }
+            state.animation_start = now + config.animation_delay;
+            state.animating = 1;
+            state.previous_workspace = state.current_workspace;  // Track the previous workspace
+            state.current_workspace = workspace;
+
+            if (config.debug) {
+                printf("Workspace changed to %d (offset: %.2f -> %.2f)\n",
+                       workspace, state.start_offset, state.target_offset);
+            }
+
+            // Request frame
+            if (!state.frame_callback) {
+                state.frame_callback = wl_surface_frame(state.surface);
+                wl_callback_add_listener(state.frame_callback, &frame_listener, NULL);
+                wl_surface_commit(state.surface);
             }
-            line = strtok(NULL, "\n");
         }
     }
 }
@@ -1170,6 +1395,7 @@ static void layer_surface_configure(void *data, struct zwlr_layer_surface_v1 *la
     }
 
     glViewport(0, 0, width, height);
+    state.force_redraw = 1;
     render_frame();
 
     // Commit the surface to display the rendered frame
@@ -1528,19 +1754,7 @@ int parse_config_file(const char *filename) {
             if (val) config.shift_per_workspace = atof(val);
         } else if (strcmp(cmd, "easing") == 0) {
             char *val = strtok(NULL, " \t");
-            if (val) {
-                if (strcmp(val, "linear") == 0) config.easing = EASE_LINEAR;
-                else if (strcmp(val, "quad") == 0) config.easing = EASE_QUAD_OUT;
-                else if (strcmp(val, "cubic") == 0) config.easing = EASE_CUBIC_OUT;
-                else if (strcmp(val, "quart") == 0) config.easing = EASE_QUART_OUT;
-                else if (strcmp(val, "quint") == 0) config.easing = EASE_QUINT_OUT;
-                else if (strcmp(val, "sine") == 0) config.easing = EASE_SINE_OUT;
-                else if (strcmp(val, "expo") == 0) config.easing = EASE_EXPO_OUT;
-                else if (strcmp(val, "circ") == 0) config.easing = EASE_CIRC_OUT;
-                else if (strcmp(val, "back") == 0) config.easing = EASE_BACK_OUT;
-                else if (strcmp(val, "elastic") == 0) config.easing = EASE_ELASTIC_OUT;
-                else if (strcmp(val, "snap") == 0) config.easing = EASE_CUSTOM_SNAP;
-            }
+            if (val) parse_easing(val, &config.easing);
         }
     }
 
@@ -1548,6 +1762,22 @@ int parse_config_file(const char *filename) {
     return 0;
 }
 
+// Set from SIGINT/SIGTERM; the main loop exits and runs its cleanup
+static volatile sig_atomic_t quit_requested = 0;
+// Self-pipe in the main loop's poll set, written by the signal handler
+static int quit_pipe[2] = {-1, -1};
+
+static void handle_quit_signal(int sig) {
+    (void)sig;
+    quit_requested = 1;
+    if (quit_pipe[1] >= 0) {
+        int saved_errno = errno;
+        ssize_t written = write(quit_pipe[1], "q", 1);
+        (void)written;
+        errno = saved_errno;
+    }
+}
+
 int main(int argc, char *argv[]) {
     // Parse arguments
     static struct option long_options[] = {
@@ -1578,17 +1808,7 @@ int main(int argc, char *argv[]) {
                 config.animation_duration = atof(optarg);
                 break;
             case 'e':
-                if (strcmp(optarg, "linear") == 0) config.easing = EASE_LINEAR;
-                else if (strcmp(optarg, "quad") == 0) config.easing = EASE_QUAD_OUT;
-                else if (strcmp(optarg, "cubic") == 0) config.easing = EASE_CUBIC_OUT;
-                else if (strcmp(optarg, "quart") == 0) config.easing = EASE_QUART_OUT;
-                else if (strcmp(optarg, "quint") == 0) config.easing = EASE_QUINT_OUT;
-                else if (strcmp(optarg, "sine") == 0) config.easing = EASE_SINE_OUT;
-                else if (strcmp(optarg, "expo") == 0) config.easing = EASE_EXPO_OUT;
-                else if (strcmp(optarg, "circ") == 0) config.easing = EASE_CIRC_OUT;
-                else if (strcmp(optarg, "back") == 0) config.easing = EASE_BACK_OUT;
-                else if (strcmp(optarg, "elastic") == 0) config.easing = EASE_ELASTIC_OUT;
-                else if (strcmp(optarg, "snap") == 0) config.easing = EASE_CUSTOM_SNAP;
+                parse_easing(optarg, &config.easing);
                 break;
             case 'f':
                 config.scale_factor = atof(optarg);
@@ -1680,19 +1900,7 @@ int main(int argc, char *argv[]) {
 
                         // Phase 3: Parse optional per-layer settings
                         layer->easing = config.easing;  // Default to global
-                        if (easing_str) {
-                            if (strcmp(easing_str, "linear") == 0) layer->easing = EASE_LINEAR;
-                            else if (strcmp(easing_str, "quad") == 0) layer->easing = EASE_QUAD_OUT;
-                            else if (strcmp(easing_str, "cubic") == 0) layer->easing = EASE_CUBIC_OUT;
-                            else if (strcmp(easing_str, "quart") == 0) layer->easing = EASE_QUART_OUT;
-                            else if (strcmp(easing_str, "quint") == 0) layer->easing = EASE_QUINT_OUT;
-                            else if (strcmp(easing_str, "sine") == 0) layer->easing = EASE_SINE_OUT;
-                            else if (strcmp(easing_str, "expo") == 0) layer->easing = EASE_EXPO_OUT;
-                            else if (strcmp(easing_str, "circ") == 0) layer->easing = EASE_CIRC_OUT;
-                            else if (strcmp(easing_str, "back") == 0) layer->easing = EASE_BACK_OUT;
-                            else if (strcmp(easing_str, "elastic") == 0) layer->easing = EASE_ELASTIC_OUT;
-                            else if (strcmp(easing_str, "snap") == 0) layer->easing = EASE_CUSTOM_SNAP;
-                        }
+                        parse_easing(easing_str, &layer->easing);
 
                         layer->animation_delay = delay_str ? atof(delay_str) : 0.0f;
                         layer->animation_duration = duration_str ? atof(duration_str) : config.animation_duration;
@@ -1907,21 +2115,40 @@ int main(int argc, char *argv[]) {
     state.running = 1;
 
     // Set up poll descriptors
-    int nfds = 2;
-    struct pollfd fds[3];
+    // Stop on SIGINT/SIGTERM by leaving the loop rather than dying in
+    // place, so the IPC socket is unlinked and GL/Wayland objects are freed.
+    // The handler also writes to a self-pipe that is polled below, so a
+    // signal landing just before poll() still wakes it instead of being lost.
+    // SA_RESETHAND restores the default action: if a frame is stuck in EGL or
+    // a Wayland roundtrip, a second signal kills the process outright.
+    if (pipe2(quit_pipe, O_NONBLOCK | O_CLOEXEC) == -1) {
+        fprintf(stderr, "Failed to create signal pipe: %s\n", strerror(errno));
+    }
+
+    struct sigaction sa = {0};
+    sa.sa_handler = handle_quit_signal;
+    sa.sa_flags = SA_RESETHAND;
+    sigemptyset(&sa.sa_mask);
+    sigaction(SIGINT, &sa, NULL);
+    sigaction(SIGTERM, &sa, NULL);
+
+    int nfds = 3;
+    struct pollfd fds[4];
     fds[0].fd = wl_display_get_fd(state.display);
     fds[0].events = POLLIN;
     fds[1].fd = state.ipc_fd;
     fds[1].events = POLLIN;
+    fds[2].fd = quit_pipe[0];
+    fds[2].events = POLLIN;
 
     // Add our IPC socket if available
     if (state.ipc_ctx && state.ipc_ctx->socket_fd >= 0) {
-        fds[2].fd = state.ipc_ctx->socket_fd;
-        fds[2].events = POLLIN;
-        nfds = 3;
+        fds[3].fd = state.ipc_ctx->socket_fd;
+        fds[3].events = POLLIN;
+        nfds = 4;
     }
 
-    while (state.running) {
+    while (state.running && !quit_requested) {
         // Dispatch Wayland events
         wl_display_dispatch_pending(state.display);
         wl_display_flush(state.display);
@@ -1929,10 +2156,17 @@ int main(int argc, char *argv[]) {
         // Calculate timeout for target FPS
         int timeout = -1;
         if (state.animating) {
-            double frame_time = 1.0 / config.target_fps;
-            double elapsed = get_time() - state.last_frame_time;
-            timeout = (int)((frame_time - elapsed) * 1000);
-            if (timeout < 0) timeout = 0;
+            double now = get_time();
+            double idle = time_until_motion(now);
+            if (idle > 0 && !state.force_redraw) {
+                // Still inside the animation delay: sleep until it ends
+                timeout = (int)ceil(idle * 1000);
+            } else {
+                double frame_time = 1.0 / config.target_fps;
+                double elapsed = now - state.last_frame_time;
+                timeout = (int)((frame_time - elapsed) * 1000);
+                if (timeout < 0) timeout = 0;
+            }
         }
 
         // Poll for events
@@ -1944,10 +2178,14 @@ int main(int argc, char *argv[]) {
                 process_ipc_events();
             }
             // Handle our IPC for dynamic layer management
-            if (nfds > 2 && (fds[2].revents & POLLIN)) {
-                if (ipc_process_commands(state.ipc_ctx)) {
+            if (nfds > 3 && (fds[3].revents & POLLIN)) {
+                // Read-only commands (list, status) leave the layers alone,
+                // so only resync and redraw when something actually changed
+                if (ipc_process_commands(state.ipc_ctx) && state.ipc_ctx->layers_dirty) {
+                    state.ipc_ctx->layers_dirty = false;
                     // Sync IPC layers with OpenGL textures
                     sync_ipc_layers();
+                    state.force_redraw = 1;
                     // Trigger re-render
                     state.animating = 1;
                     state.animation_start = get_time();
@@ -1959,7 +2197,8 @@ int main(int argc, char *argv[]) {
         if (state.animating) {
             double current_time = get_time();
             double frame_time = 1.0 / config.target_fps;
-            if (current_time - state.last_frame_time >= frame_time) {
+            if (current_time - state.last_frame_time >= frame_time &&
+                (state.force_redraw || time_until_motion(current_time) <= 0)) {
                 render_frame();
             }
         }
@@ -1983,6 +2222,12 @@ int main(int argc, char *argv[]) {
 
     if (state.ipc_fd >= 0) close(state.ipc_fd);
 
+    // Restore the default handlers before the handler's pipe goes away
+    signal(SIGINT, SIG_DFL);
+    signal(SIGTERM, SIG_DFL);
+    if (quit_pipe[0] >= 0) close(quit_pipe[0]);
+    if (quit_pipe[1] >= 0) close(quit_pipe[1]);
+
     // Clean up our IPC
     if (state.ipc_ctx) {
         ipc_cleanup(state.ipc_ctx);
@@ -11,6 +11,8 @@
 #include <sys/socket.h>
 #include <sys/un.h>
 #include <sys/stat.h>
+#include <sys/time.h>
+#include <time.h>
 #include <fcntl.h>
 #include <errno.h>
 #include <pwd.h>
@@ -24,14 +26,30 @@ static void get_socket_path(char* buffer, size_t size) {
     snprintf(buffer, size, "%s%s.sock", IPC_SOCKET_PATH_PREFIX, user);
 }
 
+// Command names and aliases, in a single table so lookup is one pass
+// that only calls strcmp on entries whose first letter matches
+static const struct {
+    const char* name;
+    ipc_command_t command;
+} ipc_commands[] = {
+    {"add",    IPC_CMD_ADD_LAYER},
+    {"remove", IPC_CMD_REMOVE_LAYER},
+    {"rm",     IPC_CMD_REMOVE_LAYER},
+    {"modify", IPC_CMD_MODIFY_LAYER},
+    {"mod",    IPC_CMD_MODIFY_LAYER},
+    {"list",   IPC_CMD_LIST_LAYERS},
+    {"ls",     IPC_CMD_LIST_LAYERS},
+    {"clear",  IPC_CMD_CLEAR_LAYERS},
+    {"reload", IPC_CMD_RELOAD_CONFIG},
+    {"status", IPC_CMD_GET_STATUS},
+};
+
 static ipc_command_t parse_command(const char* cmd) {
-    if (strcmp(cmd, "add") == 0) return IPC_CMD_ADD_LAYER;
-    if (strcmp(cmd, "remove") == 0 || strcmp(cmd, "rm") == 0) return IPC_CMD_REMOVE_LAYER;
-    if (strcmp(cmd, "modify") == 0 || strcmp(cmd, "mod") == 0) return IPC_CMD_MODIFY_LAYER;
-    if (strcmp(cmd, "list") == 0 || strcmp(cmd, "ls") == 0) return IPC_CMD_LIST_LAYERS;
-    if (strcmp(cmd, "clear") == 0) return IPC_CMD_CLEAR_LAYERS;
-    if (strcmp(cmd, "reload") == 0) return IPC_CMD_RELOAD_CONFIG;
-    if (strcmp(cmd, "status") == 0) return IPC_CMD_GET_STATUS;
+    for (size_t i = 0; i < sizeof(ipc_commands) / sizeof(ipc_commands[0]); i++) {
+        if (ipc_commands[i].name[0] == cmd[0] && strcmp(ipc_commands[i].name, cmd) == 0) {
+            return ipc_commands[i].command;
+        }
+    }
     return IPC_CMD_UNKNOWN;
 }
 
@@ -102,48 +120,22 @@ void ipc_cleanup(ipc_context_t* ctx) {
     free(ctx);
 }
 
-bool ipc_process_commands(ipc_context_t* ctx) {
-    if (!ctx || !ctx->active) return false;
-
-    // Accept new connections
-    struct sockaddr_un client_addr;
-    socklen_t client_len = sizeof(client_addr);
-    int client_fd = accept(ctx->socket_fd, (struct sockaddr*)&client_addr, &client_len);
-
-    if (client_fd < 0) {
-        if (errno != EAGAIN && errno != EWOULDBLOCK) {
-            fprintf(stderr, "Failed to accept IPC connection: %s\n", strerror(errno));
-        }
-        return false;
-    }
-
-    // Read command
-    char buffer[IPC_MAX_MESSAGE_SIZE];
-    ssize_t bytes = recv(client_fd, buffer, sizeof(buffer) - 1, 0);
-    if (bytes <= 0) {
-        close(client_fd);
-        return false;
-    }
-    buffer[bytes] = '\0';
-
-    // Parse and execute command
-    char* cmd = strtok(buffer, " \n");
+// Execute a single command line, writing its reply into response
+static bool execute_command(ipc_context_t* ctx, char* line, char* response, size_t size) {
+    char* cmd = strtok(line, " \t\r\n");
     if (!cmd) {
-        const char* error = "Error: No command specified\n";
-        send(client_fd, error, strlen(error), 0);
-        close(client_fd);
+        snprintf(response, size, "Error: No command specified\n");
         return false;
     }
 
     ipc_command_t command = parse_command(cmd);
-    char response[IPC_MAX_MESSAGE_SIZE];
     bool success = false;
 
     switch (command) {
         case IPC_CMD_ADD_LAYER: {
-            char* path = strtok(NULL, " \n");
+            char* path = strtok(NULL, " \t\r\n");
             if (!path) {
-                snprintf(response, sizeof(response), "Error: Image path required\n");
+                snprintf(response, size, "Error: Image path required\n");
                 break;
             }
 
@@ -152,7 +144,7 @@ bool ipc_process_commands(ipc_context_t* ctx) {
             int z_index = ctx->layer_count;
 
             char* param;
-            while ((param = strtok(NULL, " \n"))) {
+            while ((param = strtok(NULL, " \t\r\n"))) {
                 if (strncmp(param, "scale=", 6) == 0) {
                     scale = atof(param + 6);
                 } else if (strncmp(param, "opacity=", 8) == 0) {
@@ -168,47 +160,57 @@ bool ipc_process_commands(ipc_context_t* ctx) {
 
             uint32_t id = ipc_add_layer(ctx, path, scale, opacity, x_offset, y_offset, z_index);
             if (id > 0) {
-                snprintf(response, sizeof(response), "Layer added with ID: %u\n", id);
+                snprintf(response, size, "Layer added with ID: %u\n", id);
                 success = true;
             } else {
-                snprintf(response, sizeof(response), "Error: Failed to add layer\n");
+                snprintf(response, size, "Error: Failed to add layer\n");
             }
             break;
         }
 
         case IPC_CMD_REMOVE_LAYER: {
-            char* id_str = strtok(NULL, " \n");
+            char* id_str = strtok(NULL, " \t\r\n");
             if (!id_str) {
-                snprintf(response, sizeof(response), "Error: Layer ID required\n");
+                snprintf(response, size, "Error: Layer ID required\n");
                 break;
             }
 
             uint32_t id = atoi(id_str);
             if (ipc_remove_layer(ctx, id)) {
-                snprintf(response, sizeof(response), "Layer %u removed\n", id);
+                snprintf(response, size, "Layer %u removed\n", id);
                 success = true;
             } else {
-                snprintf(response, sizeof(response), "Error: Layer %u not found\n", id);
+                snprintf(response, size, "Error: Layer %u not found\n", id);
             }
             break;
         }
 
         case IPC_CMD_MODIFY_LAYER: {
-            char* id_str = strtok(NULL, " \n");
-            char* property = strtok(NULL, " \n");
-            char* value = strtok(NULL, " \n");
+            char* id_str = strtok(NULL, " \t\r\n");
+            char* property = strtok(NULL, " \t\r\n");
+            char* value = strtok(NULL, " \t\r\n");
 
             if (!id_str || !property || !value) {
-                snprintf(response, sizeof(response), "Error: Usage: modify <id> <property> <value>\n");
+                snprintf(response, size, "Error: Usage: modify <id> <property> <value>\n");
+                break;
+            }
+
+            if (strcmp(id_str, "all") == 0) {
+                if (ipc_modify_all_layers(ctx, property, value)) {
+                    snprintf(response, size, "%d layers modified\n", ctx->layer_count);
+                    success = true;
+                } else {
+                    snprintf(response, size, "Error: Failed to modify layers\n");
+                }
                 break;
             }
 
             uint32_t id = atoi(id_str);
             if (ipc_modify_layer(ctx, id, property, value)) {
-                snprintf(response, sizeof(response), "Layer %u modified\n", id);
+                snprintf(response, size, "Layer %u modified\n", id);
                 success = true;
             } else {
-                snprintf(response, sizeof(response), "Error: Failed to modify layer %u\n", id);
+                snprintf(response, size, "Error: Failed to modify layer %u\n", id);
             }
             break;
         }
@@ -216,12 +218,12 @@ bool ipc_process_commands(ipc_context_t* ctx) {
         case IPC_CMD_LIST_LAYERS: {
             char* list = ipc_list_layers(ctx);
             if (list) {
-                strncpy(response, list, sizeof(response) - 1);
-                response[sizeof(response) - 1] = '\0';
+                strncpy(response, list, size - 1);
+                response[size - 1] = '\0';
                 free(list);
                 success = true;
             } else {
-                snprintf(response, sizeof(response), "No layers\n");
+                snprintf(response, size, "No layers\n");
                 success = true;
             }
             break;
@@ -229,29 +231,134 @@ bool ipc_process_commands(ipc_context_t* ctx) {
 
         case IPC_CMD_CLEAR_LAYERS:
             ipc_clear_layers(ctx);
-            snprintf(response, sizeof(response), "All layers cleared\n");
+            snprintf(response, size, "All layers cleared\n");
             success = true;
             break;
 
         case IPC_CMD_GET_STATUS:
-            snprintf(response, sizeof(response),
+            snprintf(response, size,
                 "Status: Active\nLayers: %d/%d\nSocket: %s\n",
                 ctx->layer_count, IPC_MAX_LAYERS, ctx->socket_path);
             success = true;
             break;
 
         default:
-            snprintf(response, sizeof(response), "Error: Unknown command '%s'\n", cmd);
+            snprintf(response, size, "Error: Unknown command '%s'\n", cmd);
             break;
     }
 
+    return success;
+}
+
+// Milliseconds left until deadline, rounded up (zero or less once it passed)
+static long ms_until(const struct timespec* deadline) {
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    long ns = (deadline->tv_sec - now.tv_sec) * 1000000000L + (deadline->tv_nsec - now.tv_nsec);
+    return (ns + 999999) / 1000000;
+}
+
+// Bound a blocking recv/send on fd by the time left until deadline
+static void set_client_timeout(int fd, int optname, const struct timespec* deadline) {
+    // A zero timeval would mean "block forever", so never go below 1 ms
+    long ms = ms_until(deadline);
+    if (ms < 1) ms = 1;
+    struct timeval timeout = {ms / 1000, (ms % 1000) * 1000};
+    setsockopt(fd, SOL_SOCKET, optname, &timeout, sizeof(timeout));
+}
+
+// Read one client's message, run its commands and send the replies
+static bool handle_client(ipc_context_t* ctx, int client_fd, const struct timespec* deadline) {
+    // Clients are served on the render thread, so one that connects but
+    // never sends (or never reads its reply) must not stall it past deadline
+    set_client_timeout(client_fd, SO_RCVTIMEO, deadline);
+
+    // Read command
+    char buffer[IPC_MAX_MESSAGE_SIZE];
+    ssize_t bytes = recv(client_fd, buffer, sizeof(buffer) - 1, 0);
+    if (bytes <= 0) {
+        close(client_fd);
+        return false;
+    }
+    buffer[bytes] = '\0';
+
+    // A message may carry several newline-separated commands so clients can
+    // batch updates into a single round trip; replies are concatenated
+    char response[IPC_MAX_MESSAGE_SIZE];
+    size_t offset = 0;
+    bool success = false;
+    int executed = 0;
+    char* saveptr = NULL;
+    response[0] = '\0';
+
+    for (char* line = strtok_r(buffer, "\n", &saveptr); line;
+         line = strtok_r(NULL, "\n", &saveptr)) {
+        if (strspn(line, " \t\r") == strlen(line)) continue;
+
+        char reply[IPC_MAX_MESSAGE_SIZE];
+        if (execute_command(ctx, line, reply, sizeof(reply))) {
+            success = true;
+        }
+        executed++;
+
+        size_t len = strlen(reply);
+        if (offset + len >= sizeof(response)) {
+            len = sizeof(response) - offset - 1;
+        }
+        memcpy(response + offset, reply, len);
+        offset += len;
+        response[offset] = '\0';
+    }
+
+    if (executed == 0) {
+        snprintf(response, sizeof(response), "Error: No command specified\n");
+    }
+
     // Send response
+    set_client_timeout(client_fd, SO_SNDTIMEO, deadline);
     send(client_fd, response, strlen(response), 0);
     close(client_fd);
 
     return success;
 }
 
+bool ipc_process_commands(ipc_context_t* ctx) {
+    if (!ctx || !ctx->active) return false;
+
+    // Drain every queued connection so a burst of clients is handled in one
+    // wake-up (and one layer sync by the caller) instead of one per poll().
+    // All of them share one deadline, so slow or stalled clients cannot add
+    // up to more than IPC_CLIENT_TIMEOUT_MS; the rest wait for the next wake
+    struct timespec deadline;
+    clock_gettime(CLOCK_MONOTONIC, &deadline);
+    deadline.tv_sec += IPC_CLIENT_TIMEOUT_MS / 1000;
+    deadline.tv_nsec += (IPC_CLIENT_TIMEOUT_MS % 1000) * 1000000L;
+    if (deadline.tv_nsec >= 1000000000L) {
+        deadline.tv_sec++;
+        deadline.tv_nsec -= 1000000000L;
+    }
+
+    bool success = false;
+    for (int i = 0; i < IPC_MAX_CLIENTS_PER_WAKE && ms_until(&deadline) > 0; i++) {
+        struct sockaddr_un client_addr;
+        socklen_t client_len = sizeof(client_addr);
+        int client_fd = accept(ctx->socket_fd, (struct sockaddr*)&client_addr, &client_len);
+
+        if (client_fd < 0) {
+            if (errno != EAGAIN && errno != EWOULDBLOCK) {
+                fprintf(stderr, "Failed to accept IPC connection: %s\n", strerror(errno));
+            }
+            break;
+        }
+
+        if (handle_client(ctx, client_fd, &deadline)) {
+            success = true;
+        }
+    }
+
+    return success;
+}
+
 uint32_t ipc_add_layer(ipc_context_t* ctx, const char* image_path, float scale, float opacity, float x_offset, float y_offset, int z_index) {
     if (!ctx || !image_path || ctx->layer_count >= IPC_MAX_LAYERS) {
         return 0;
@@ -277,6 +384,7 @@ uint32_t ipc_add_layer(ipc_context_t* ctx, const char* image_path, float scale,
 
     ctx->layers[ctx->layer_count++] = layer;
     ipc_sort_layers(ctx);
+    ctx->layers_dirty = true;
 
     return layer->id;
 }
@@ -295,6 +403,7 @@ bool ipc_remove_layer(ipc_context_t* ctx, uint32_t layer_id) {
                 ctx->layers[j] = ctx->layers[j + 1];
             }
             ctx->layers[--ctx->layer_count] = NULL;
+            ctx->layers_dirty = true;
 
             return true;
         }
@@ -309,21 +418,36 @@ bool ipc_modify_layer(ipc_context_t* ctx, uint32_t layer_id, const char* propert
     layer_t* layer = ipc_find_layer(ctx, layer_id);
     if (!layer) return false;
 
+    // Setting a property to its current value succeeds but changes nothing,
+    // so it must not mark the layers dirty and cost a resync and redraw
+    bool changed = false;
     bool needs_sort = false;
 
     if (strcmp(property, "scale") == 0) {
-        layer->scale = atof(value);
+        float scale = atof(value);
+        changed = layer->scale != scale;
+        layer->scale = scale;
     } else if (strcmp(property, "opacity") == 0) {
-        layer->opacity = atof(value);
+        float opacity = atof(value);
+        changed = layer->opacity != opacity;
+        layer->opacity = opacity;
     } else if (strcmp(property, "x") == 0) {
-        layer->x_offset = atof(value);
+        float x_offset = atof(value);
+        changed = layer->x_offset != x_offset;
+        layer->x_offset = x_offset;
     } else if (strcmp(property, "y") == 0) {
-        layer->y_offset = atof(value);
+        float y_offset = atof(value);
+        changed = layer->y_offset != y_offset;
+        layer->y_offset = y_offset;
     } else if (strcmp(property, "z") == 0) {
-        layer->z_index = atoi(value);
-        needs_sort = true;
+        int z_index = atoi(value);
+        changed = layer->z_index != z_index;
+        layer->z_index = z_index;
+        needs_sort = changed;
     } else if (strcmp(property, "visible") == 0) {
-        layer->visible = (strcmp(value, "true") == 0 || strcmp(value, "1") == 0);
+        bool visible = (strcmp(value, "true") == 0 || strcmp(value, "1") == 0);
+        changed = layer->visible != visible;
+        layer->visible = visible;
     } else {
         return false;
     }
@@ -331,6 +455,32 @@ bool ipc_modify_layer(ipc_context_t* ctx, uint32_t layer_id, const char* propert
     if (needs_sort) {
         ipc_sort_layers(ctx);
     }
+    if (changed) {
+        ctx->layers_dirty = true;
+    }
+
+    return true;
+}
+
+// Apply one property change to every layer, so a global change such as a
+// fade is a single command rather than one per layer
+bool ipc_modify_all_layers(ipc_context_t* ctx, const char* property, const char* value) {
+    if (!ctx) return false;
+
+    // Changing z re-sorts ctx->layers, so walk a snapshot of the IDs
+    uint32_t ids[IPC_MAX_LAYERS];
+    int count = ctx->layer_count;
+    for (int i = 0; i < count; i++) {
+        ids[i] = ctx->layers[i]->id;
+    }
+
+    for (int i = 0; i < count; i++) {
+        // Only an unknown property can fail here, and it fails on the first
+        // layer before anything has been changed
+        if (!ipc_modify_layer(ctx, ids[i], property, value)) {
+            return false;
+        }
+    }
 
     return true;
 }
@@ -368,6 +518,7 @@ void ipc_clear_layers(ipc_context_t* ctx) {
         }
     }
     ctx->layer_count = 0;
+    ctx->layers_dirty = true;
 }
 
 layer_t* ipc_find_layer(ipc_context_t* ctx, uint32_t layer_id) {
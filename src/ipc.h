@@ -12,6 +12,8 @@
 #define IPC_SOCKET_PATH_PREFIX "/tmp/hyprlax-"
 #define IPC_MAX_MESSAGE_SIZE 4096
 #define IPC_MAX_LAYERS 32
+#define IPC_MAX_CLIENTS_PER_WAKE 16  // Connections drained per ipc_process_commands()
+#define IPC_CLIENT_TIMEOUT_MS 100    // Longest one wake may spend serving clients
 
 typedef enum {
     IPC_CMD_ADD_LAYER,
@@ -47,6 +49,7 @@ typedef struct {
     layer_t* layers[IPC_MAX_LAYERS];
     int layer_count;
     uint32_t next_layer_id;
+    bool layers_dirty;  // Set when the layer set changes; cleared by the consumer
 } ipc_context_t;
 
 // IPC lifecycle functions
@@ -58,6 +61,7 @@ bool ipc_process_commands(ipc_context_t* ctx);
 uint32_t ipc_add_layer(ipc_context_t* ctx, const char* image_path, float scale, float opacity, float x_offset, float y_offset, int z_index);
 bool ipc_remove_layer(ipc_context_t* ctx, uint32_t layer_id);
 bool ipc_modify_layer(ipc_context_t* ctx, uint32_t layer_id, const char* property, const char* value);
+bool ipc_modify_all_layers(ipc_context_t* ctx, const char* property, const char* value);
 char* ipc_list_layers(ipc_context_t* ctx);
 void ipc_clear_layers(ipc_context_t* ctx);
 
@@ -78,26 +78,27 @@ END_TEST
 
 START_TEST(test_blur_shader_selection)
 {
-    float BLUR_MIN_THRESHOLD = 0.001f;
+    float BLUR_MIN_VISIBLE = 0.05f;
     int blur_shader_program = 5;
     int standard_shader_program = 4;
     
-    struct layer layers[3] = {
+    struct layer layers[4] = {
         {.blur_amount = 0.0f},    // Should use standard shader
         {.blur_amount = 0.0005f},  // Should use standard shader (below threshold)
+        {.blur_amount = 0.02f},    // Should use standard shader (under half a pixel)
         {.blur_amount = 2.0f}      // Should use blur shader
     };
     
-    for (int i = 0; i < 3; i++) {
+    for (int i = 0; i < 4; i++) {
         int selected_shader;
         
-        if (layers[i].blur_amount > BLUR_MIN_THRESHOLD && blur_shader_program != 0) {
+        if (layers[i].blur_amount >= BLUR_MIN_VISIBLE && blur_shader_program != 0) {
             selected_shader = blur_shader_program;
         } else {
             selected_shader = standard_shader_program;
         }
         
-        if (i < 2) {
+        if (i < 3) {
             ck_assert_int_eq(selected_shader, standard_shader_program);
         } else {
             ck_assert_int_eq(selected_shader, blur_shader_program);
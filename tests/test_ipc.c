@@ -9,6 +9,7 @@
 #include <sys/wait.h>
 #include <pwd.h>
 #include <errno.h>
+#include <time.h>
 
 #include "../src/ipc.h"
 
@@ -22,6 +23,65 @@ static void get_test_socket_path(char* buffer, size_t size) {
     snprintf(buffer, size, "/tmp/hyprlax-test-%s.sock", user);
 }
 
+// Helper function to fill in a Unix socket address
+static void fill_socket_addr(struct sockaddr_un* addr, const char* socket_path) {
+    memset(addr, 0, sizeof(*addr));
+    addr->sun_family = AF_UNIX;
+    strncpy(addr->sun_path, socket_path, sizeof(addr->sun_path) - 1);
+}
+
+// Helper function to fork a server that handles one successful message
+static pid_t fork_test_server(void) {
+    pid_t pid = fork();
+    if (pid == 0) {
+        // Child process - server
+        ipc_context_t* ctx = ipc_init();
+        if (!ctx) exit(1);
+
+        // Wait for one connection and process it
+        for (int i = 0; i < 100; i++) {
+            if (ipc_process_commands(ctx)) {
+                break;
+            }
+            usleep(10000); // 10ms
+        }
+
+        ipc_cleanup(ctx);
+        exit(0);
+    }
+
+    usleep(50000); // Give server time to start
+    return pid;
+}
+
+// Helper function to connect to the hyprlax socket, retrying while the
+// server starts up. Returns the connected socket or -1.
+static int connect_to_server(void) {
+    char socket_path[256];
+    const char* user = getenv("USER");
+    if (!user) {
+        struct passwd* pw = getpwuid(getuid());
+        user = pw ? pw->pw_name : "unknown";
+    }
+    snprintf(socket_path, sizeof(socket_path), "/tmp/hyprlax-%s.sock", user);
+
+    int sock = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (sock < 0) return -1;
+
+    struct sockaddr_un addr;
+    fill_socket_addr(&addr, socket_path);
+
+    for (int i = 0; i < 10; i++) {
+        if (connect(sock, (struct sockaddr*)&addr, sizeof(addr)) == 0) {
+            return sock;
+        }
+        usleep(10000);
+    }
+
+    close(sock);
+    return -1;
+}
+
 // Test fixture - runs before each test
 static ipc_context_t* test_ctx = NULL;
 static char* test_image = NULL;
@@ -148,6 +208,34 @@ START_TEST(test_ipc_modify_layer)
 }
 END_TEST
 
+// Test modifying every layer at once
+START_TEST(test_ipc_modify_all_layers)
+{
+    ipc_context_t* ctx = ipc_init();
+    ck_assert_ptr_nonnull(ctx);
+
+    // Nothing to modify yet: a no-op, not a failure
+    ck_assert(ipc_modify_all_layers(ctx, "opacity", "0.5") == true);
+    ck_assert(ctx->layers_dirty == false);
+
+    uint32_t id1 = ipc_add_layer(ctx, test_image, 1.0f, 1.0f, 0.0f, 0.0f, 0);
+    uint32_t id2 = ipc_add_layer(ctx, test_image, 1.0f, 1.0f, 0.0f, 0.0f, 1);
+
+    ck_assert(ipc_modify_all_layers(ctx, "opacity", "0.5") == true);
+    ck_assert_float_eq(ipc_find_layer(ctx, id1)->opacity, 0.5f);
+    ck_assert_float_eq(ipc_find_layer(ctx, id2)->opacity, 0.5f);
+
+    // Re-sorting on z must not skip or repeat layers
+    ck_assert(ipc_modify_all_layers(ctx, "z", "3") == true);
+    ck_assert_int_eq(ipc_find_layer(ctx, id1)->z_index, 3);
+    ck_assert_int_eq(ipc_find_layer(ctx, id2)->z_index, 3);
+
+    ck_assert(ipc_modify_all_layers(ctx, "invalid", "1") == false);
+
+    ipc_cleanup(ctx);
+}
+END_TEST
+
 // Test listing layers
 START_TEST(test_ipc_list_layers)
 {
@@ -243,6 +331,42 @@ START_TEST(test_ipc_max_layers)
 }
 END_TEST
 
+// Test dirty tracking of layer changes
+START_TEST(test_ipc_dirty_tracking)
+{
+    ipc_context_t* ctx = ipc_init();
+    ck_assert_ptr_nonnull(ctx);
+    ck_assert(!ctx->layers_dirty);
+
+    uint32_t id = ipc_add_layer(ctx, test_image, 1.0f, 1.0f, 0.0f, 0.0f, 0);
+    ck_assert(ctx->layers_dirty);
+    ctx->layers_dirty = false;
+
+    // Queries and failed changes leave the flag alone
+    char* list = ipc_list_layers(ctx);
+    free(list);
+    ck_assert_ptr_nonnull(ipc_find_layer(ctx, id));
+    ck_assert(!ipc_remove_layer(ctx, 999));
+    ck_assert(!ipc_modify_layer(ctx, id, "invalid", "1.0"));
+    ck_assert(!ctx->layers_dirty);
+
+    ck_assert(ipc_modify_layer(ctx, id, "opacity", "0.5"));
+    ck_assert(ctx->layers_dirty);
+    ctx->layers_dirty = false;
+
+    // Re-sending the current value is accepted but is not a change
+    ck_assert(ipc_modify_layer(ctx, id, "opacity", "0.5"));
+    ck_assert(ipc_modify_layer(ctx, id, "visible", "true"));
+    ck_assert(ipc_modify_layer(ctx, id, "z", "0"));
+    ck_assert(!ctx->layers_dirty);
+
+    ck_assert(ipc_remove_layer(ctx, id));
+    ck_assert(ctx->layers_dirty);
+
+    ipc_cleanup(ctx);
+}
+END_TEST
+
 // Test client-server communication
 START_TEST(test_ipc_client_server)
 {
@@ -318,6 +442,124 @@ START_TEST(test_ipc_client_server)
 }
 END_TEST
 
+// Test several newline-separated commands in one message
+START_TEST(test_ipc_batch_commands)
+{
+    pid_t pid = fork_test_server();
+
+    int sock = connect_to_server();
+    ck_assert_int_ge(sock, 0);
+
+    char cmd[512];
+    snprintf(cmd, sizeof(cmd), "add %s\nadd %s opacity=0.5\n\nstatus\n",
+             test_image, test_image);
+    send(sock, cmd, strlen(cmd), 0);
+
+    char buffer[1024];
+    ssize_t n = recv(sock, buffer, sizeof(buffer) - 1, 0);
+    ck_assert_int_gt(n, 0);
+    buffer[n] = '\0';
+    ck_assert_ptr_nonnull(strstr(buffer, "Layer added with ID: 1"));
+    ck_assert_ptr_nonnull(strstr(buffer, "Layer added with ID: 2"));
+    ck_assert_ptr_nonnull(strstr(buffer, "Layers: 2/"));
+
+    close(sock);
+
+    int status;
+    waitpid(pid, &status, 0);
+
+    // The same batch with CRLF line endings
+    pid = fork_test_server();
+
+    sock = connect_to_server();
+    ck_assert_int_ge(sock, 0);
+
+    snprintf(cmd, sizeof(cmd), "add %s\r\nadd %s opacity=0.5\r\n\r\nstatus\r\n",
+             test_image, test_image);
+    send(sock, cmd, strlen(cmd), 0);
+
+    n = recv(sock, buffer, sizeof(buffer) - 1, 0);
+    ck_assert_int_gt(n, 0);
+    buffer[n] = '\0';
+    ck_assert_ptr_null(strstr(buffer, "Error"));
+    ck_assert_ptr_nonnull(strstr(buffer, "Layer added with ID: 2"));
+    ck_assert_ptr_nonnull(strstr(buffer, "Layers: 2/"));
+
+    close(sock);
+
+    waitpid(pid, &status, 0);
+}
+END_TEST
+
+// Test that a client which never sends cannot stall the server
+START_TEST(test_ipc_stalled_client)
+{
+    ipc_context_t* ctx = ipc_init();
+    ck_assert_ptr_nonnull(ctx);
+
+    struct sockaddr_un addr;
+    fill_socket_addr(&addr, ctx->socket_path);
+
+    // Connect several clients that never send anything
+    int socks[4];
+    for (int i = 0; i < 4; i++) {
+        socks[i] = socket(AF_UNIX, SOCK_STREAM, 0);
+        ck_assert_int_ge(socks[i], 0);
+        ck_assert_int_eq(connect(socks[i], (struct sockaddr*)&addr, sizeof(addr)), 0);
+    }
+
+    // The server gives up instead of blocking forever, and the stalls share
+    // one deadline rather than adding up per client
+    struct timespec start, end;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    ck_assert(ipc_process_commands(ctx) == false);
+    clock_gettime(CLOCK_MONOTONIC, &end);
+    ck_assert_int_eq(ctx->layer_count, 0);
+
+    long elapsed_ms = (end.tv_sec - start.tv_sec) * 1000 + (end.tv_nsec - start.tv_nsec) / 1000000;
+    ck_assert_int_lt(elapsed_ms, 2 * IPC_CLIENT_TIMEOUT_MS);
+
+    for (int i = 0; i < 4; i++) {
+        close(socks[i]);
+    }
+    ipc_cleanup(ctx);
+}
+END_TEST
+
+// Test that one call drains every queued client connection
+START_TEST(test_ipc_drain_pending_clients)
+{
+    ipc_context_t* ctx = ipc_init();
+    ck_assert_ptr_nonnull(ctx);
+
+    struct sockaddr_un addr;
+    fill_socket_addr(&addr, ctx->socket_path);
+
+    // Queue three clients before the server gets a chance to run
+    char cmd[512];
+    snprintf(cmd, sizeof(cmd), "add %s", test_image);
+    int socks[3];
+    for (int i = 0; i < 3; i++) {
+        socks[i] = socket(AF_UNIX, SOCK_STREAM, 0);
+        ck_assert_int_ge(socks[i], 0);
+        ck_assert_int_eq(connect(socks[i], (struct sockaddr*)&addr, sizeof(addr)), 0);
+        send(socks[i], cmd, strlen(cmd), 0);
+    }
+
+    ck_assert(ipc_process_commands(ctx) == true);
+    ck_assert_int_eq(ctx->layer_count, 3);
+
+    for (int i = 0; i < 3; i++) {
+        close(socks[i]);
+    }
+
+    // Nothing left to accept
+    ck_assert(ipc_process_commands(ctx) == false);
+
+    ipc_cleanup(ctx);
+}
+END_TEST
+
 // Create the test suite
 Suite *ipc_suite(void)
 {
@@ -340,10 +582,12 @@ Suite *ipc_suite(void)
     tcase_add_test(tc_layers, test_ipc_add_layer);
     tcase_add_test(tc_layers, test_ipc_remove_layer);
     tcase_add_test(tc_layers, test_ipc_modify_layer);
+    tcase_add_test(tc_layers, test_ipc_modify_all_layers);
     tcase_add_test(tc_layers, test_ipc_list_layers);
     tcase_add_test(tc_layers, test_ipc_clear_layers);
     tcase_add_test(tc_layers, test_ipc_sort_layers);
     tcase_add_test(tc_layers, test_ipc_max_layers);
+    tcase_add_test(tc_layers, test_ipc_dirty_tracking);
     suite_add_tcase(s, tc_layers);
     
     // Communication test case
@@ -351,6 +595,9 @@ Suite *ipc_suite(void)
     tcase_add_checked_fixture(tc_comm, setup, teardown);
     tcase_set_timeout(tc_comm, 5);  // 5 second timeout
     tcase_add_test(tc_comm, test_ipc_client_server);
+    tcase_add_test(tc_comm, test_ipc_batch_commands);
+    tcase_add_test(tc_comm, test_ipc_drain_pending_clients);
+    tcase_add_test(tc_comm, test_ipc_stalled_client);
     suite_add_tcase(s, tc_comm);
     
     return s;